@@ -10,11 +10,11 @@ replaced with placeholder HTML since they would make exports too large.
 import base64
 import re
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Callable, List, Optional, Tuple
 import mimetypes
 
 # Import shared media type definitions and scanner from utils to avoid duplication
-from backend.utils import MEDIA_EXTENSIONS, get_media_type, scan_notes_fast_walk
+from backend.utils import MEDIA_EXTENSIONS, get_media_type, get_all_folders
 
 
 def get_media_as_base64(media_path: Path) -> Optional[Tuple[str, str]]:
@@ -80,10 +80,27 @@ def strip_frontmatter(content: str) -> str:
     return '\n'.join(lines[end_idx + 1:]).strip()
 
 
-def find_media_in_attachments(media_name: str, note_folder: Path, notes_dir: Path) -> Optional[Path]:
+def get_attachment_folders(notes_dir: Path) -> List[str]:
+    """All _attachments folders in the vault (relative, posix-style paths)."""
+    return [
+        folder for folder in get_all_folders(str(notes_dir))
+        if folder == '_attachments' or folder.endswith('/_attachments')
+    ]
+
+
+def find_media_in_attachments(
+    media_name: str,
+    note_folder: Path,
+    notes_dir: Path,
+    attachment_folders: Optional[Callable[[], List[str]]] = None
+) -> Optional[Path]:
     """
     Search for a media file in common attachment locations.
     Returns the resolved path if found, None otherwise.
+    
+    attachment_folders, if given, is called (only when the fallback search is
+    needed) instead of get_attachment_folders, so callers resolving several
+    references can share one walk of the vault.
     """
     # Common locations to search for media (fast path)
     search_paths = [
@@ -111,17 +128,15 @@ def find_media_in_attachments(media_name: str, note_folder: Path, notes_dir: Pat
     # Fallback: search all _attachments folders recursively (slower but thorough)
     # This handles cross-folder media references like in Obsidian
     try:
-        _files, folders = scan_notes_fast_walk(str(notes_dir), include_media=False)
+        folders = attachment_folders() if attachment_folders else get_attachment_folders(notes_dir)
         for folder in folders:
-            if folder == '_attachments' or folder.endswith('/_attachments'):
-                attachment_folder = notes_dir / folder
-                candidate = attachment_folder / media_name
-                if candidate.exists() and candidate.is_file():
-                    try:
-                        candidate.resolve().relative_to(notes_dir.resolve())
-                        return candidate.resolve()
-                    except ValueError:
-                        continue
+            candidate = notes_dir / folder / media_name
+            if candidate.exists() and candidate.is_file():
+                try:
+                    candidate.resolve().relative_to(notes_dir.resolve())
+                    return candidate.resolve()
+                except ValueError:
+                    continue
     except Exception:
         pass  # Ignore errors in recursive search
     
@@ -164,6 +179,16 @@ def process_media_for_export(markdown_content: str, note_folder: Path, notes_dir
     - Audio/Video/PDF: Replaced with styled placeholder HTML (not embedded - too large)
     """
     
+    # The vault is walked at most once per export, and only if some media
+    # reference needs the fallback search
+    found_folders: Optional[List[str]] = None
+    
+    def attachment_folders() -> List[str]:
+        nonlocal found_folders
+        if found_folders is None:
+            found_folders = get_attachment_folders(notes_dir)
+        return found_folders
+    
     # First, handle wikilink media: ![[file.png]] or ![[file.mp3|alt text]]
     wikilink_pattern = r'!\[\[([^\]|]+)(?:\|([^\]]+))?\]\]'
     
@@ -179,7 +204,7 @@ def process_media_for_export(markdown_content: str, note_folder: Path, notes_dir
             return generate_media_placeholder(media_type, alt_text)
         
         # For images, embed as base64
-        resolved_path = find_media_in_attachments(media_name, note_folder, notes_dir)
+        resolved_path = find_media_in_attachments(media_name, note_folder, notes_dir, attachment_folders)
         
         if resolved_path:
             base64_url = get_image_as_base64(resolved_path)
@@ -246,7 +271,7 @@ def process_media_for_export(markdown_content: str, note_folder: Path, notes_dir
         if not resolved_path.exists():
             # Extract just the filename and search
             media_name = Path(media_path).name
-            resolved_path = find_media_in_attachments(media_name, note_folder, notes_dir)
+            resolved_path = find_media_in_attachments(media_name, note_folder, notes_dir, attachment_folders)
             if not resolved_path:
                 return match.group(0)  # Keep original if not found
         
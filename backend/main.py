@@ -8,6 +8,7 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse, JSONResponse, FileResponse, RedirectResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials, APIKeyHeader
+from fastapi.concurrency import run_in_threadpool
 from starlette.middleware.sessions import SessionMiddleware
 import os
 import yaml
@@ -44,6 +45,7 @@ from .utils import (
     apply_template_placeholders,
     paginate,
     get_backlinks,
+    get_notes_listing_etag,
 )
 from .plugins import PluginManager
 from .themes import get_available_themes, get_theme_css
@@ -1032,6 +1034,8 @@ async def create_note_from_template(request: Request, data: dict):
 
 @api_router.get("/notes", tags=["Notes"])
 async def list_notes(
+    request: Request,
+    http_response: Response,
     limit: Optional[int] = None,
     offset: int = 0
 ):
@@ -1050,10 +1054,21 @@ async def list_notes(
         GET /api/notes              -> All notes
         GET /api/notes?limit=20     -> First 20 notes
         GET /api/notes?limit=20&offset=20 -> Notes 21-40
+    
+    Responses carry an ETag; clients sending it back in If-None-Match get a
+    304 Not Modified while the listing is unchanged.
     """
     try:
         notes, folders = scan_notes_fast_walk(config['storage']['notes_dir'], include_media=True)
         
+        # Conditional request: skip building and serializing an unchanged listing
+        etag = get_notes_listing_etag(notes, folders)
+        cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in (tag.strip() for tag in if_none_match.split(",")):
+            return Response(status_code=304, headers=cache_headers)
+        http_response.headers.update(cache_headers)
+        
         # Apply pagination with consistent sorting by path for stable results
         result = paginate(
             items=notes,
@@ -1348,7 +1363,9 @@ async def search(
                 "message": "No search term provided"
             }
 
-        results = search_notes(config['storage']['notes_dir'], q)
+        # Search reads every note; run it off the event loop so other
+        # requests aren't blocked while it works
+        results = await run_in_threadpool(search_notes, config['storage']['notes_dir'], q)
 
         # Run plugin hooks
         plugin_manager.run_hook('on_search', query=q, results=results)
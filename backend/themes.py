@@ -2,39 +2,84 @@
 Theme management for NoteDiscovery
 """
 
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Tuple
 import re
 
+# Precompiled patterns (avoid re-compiling / cache lookups per call)
+_THEME_TYPE_RE = re.compile(r'@theme-type:\s*(light|dark)')
+_THEME_ID_RE = re.compile(r'^[a-zA-Z0-9_-]+$')
+
+# How much of a theme file to scan for the @theme-type header
+_THEME_HEADER_BYTES = 1024
+
+# Parsed metadata per theme file: {theme_path: (mtime_ns, metadata)}
+_theme_meta_cache: Dict[str, Tuple[int, Dict[str, str]]] = {}
+
+# Theme listing per directory: {themes_dir: (signature, themes)}
+# The signature is built from the .css files' names and mtimes, so adding,
+# removing or editing a theme invalidates the listing.
+_themes_list_cache: Dict[str, Tuple[Tuple, List[Dict]]] = {}
+
 
 def parse_theme_metadata(theme_path: Path) -> Dict[str, str]:
     """Parse theme metadata from CSS file comments"""
+    cache_key = str(theme_path)
+    try:
+        mtime_ns = os.stat(theme_path).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    
+    cached = _theme_meta_cache.get(cache_key)
+    if cached is not None and mtime_ns is not None and cached[0] == mtime_ns:
+        return dict(cached[1])
+    
     metadata = {
         "type": "dark"  # Default to dark for backward compatibility
     }
     
     try:
-        with open(theme_path, 'r', encoding='utf-8') as f:
-            # Read first few lines to find metadata
-            for i, line in enumerate(f):
-                if i > 10:  # Only check first 10 lines
-                    break
-                
-                # Look for @theme-type metadata
-                if '@theme-type:' in line:
-                    # Extract the value (light or dark)
-                    match = re.search(r'@theme-type:\s*(light|dark)', line)
-                    if match:
-                        metadata["type"] = match.group(1)
-                        break
+        # Metadata lives in the header comment - only read the first 1KB
+        with open(theme_path, 'rb') as f:
+            head = f.read(_THEME_HEADER_BYTES).decode('utf-8', 'replace')
+        
+        # Look for @theme-type metadata (light or dark)
+        match = _THEME_TYPE_RE.search(head)
+        if match:
+            metadata["type"] = match.group(1)
     except Exception as e:
         print(f"Error parsing theme metadata from {theme_path}: {e}")
+        return metadata
+    
+    if mtime_ns is not None:
+        _theme_meta_cache[cache_key] = (mtime_ns, dict(metadata))
     
     return metadata
 
 
+def _themes_dir_signature(themes_dir: str) -> Tuple:
+    """Cheap change detector for a themes directory (one scandir, no file reads)"""
+    entries = []
+    with os.scandir(themes_dir) as it:
+        for entry in it:
+            if entry.name.endswith('.css'):
+                entries.append((entry.name, entry.stat().st_mtime_ns))
+    return tuple(sorted(entries))
+
+
 def get_available_themes(themes_dir: str) -> List[Dict[str, str]]:
     """Get all available themes from the themes directory"""
+    try:
+        signature = _themes_dir_signature(themes_dir)
+    except OSError:
+        signature = None
+    
+    cached = _themes_list_cache.get(themes_dir)
+    if cached is not None and signature is not None and cached[0] == signature:
+        return [dict(theme) for theme in cached[1]]
+    
     themes_path = Path(themes_dir)
     themes = []
     
@@ -68,16 +113,17 @@ def get_available_themes(themes_dir: str) -> List[Dict[str, str]]:
                 "builtin": False
             })
     
+    if signature is not None:
+        _themes_list_cache[themes_dir] = (signature, [dict(theme) for theme in themes])
+    
     return themes
 
 
 def get_theme_css(themes_dir: str, theme_id: str) -> str:
     """Get the CSS content for a specific theme"""
-    import re
-    
     # Security: Validate theme_id to prevent path traversal
     # Only allow alphanumeric, hyphens, and underscores
-    if not re.match(r'^[a-zA-Z0-9_-]+$', theme_id):
+    if not _THEME_ID_RE.match(theme_id):
         return ""
     
     themes_path = Path(themes_dir)
@@ -87,9 +133,17 @@ def get_theme_css(themes_dir: str, theme_id: str) -> str:
     if not theme_path.resolve().is_relative_to(themes_path.resolve()):
         return ""
     
-    if not theme_path.exists():
+    # One stat instead of exists() + open(); content is cached per file version
+    try:
+        st = os.stat(theme_path)
+        return _read_theme_css(str(theme_path), st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
         return ""
-    
+
+
+@lru_cache(maxsize=32)
+def _read_theme_css(theme_path: str, mtime_ns: int, size: int) -> str:
+    """Read a theme's CSS (cached; mtime_ns/size make edited files miss the cache)"""
     with open(theme_path, 'r', encoding='utf-8') as f:
         return f.read()
 
@@ -2,16 +2,28 @@
 Utility functions for file operations, search, and markdown processing
 """
 
+import errno
+import hashlib
+import heapq
+import math
+import mmap
 import os
 import re
 import shutil
 import threading
 import time
 import urllib.parse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
+from html import escape
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple, Any, TypeVar, Callable
-from datetime import datetime, timezone
+from stat import S_ISDIR, S_ISLNK, S_ISREG
+from typing import List, Dict, Optional, Tuple, Any, TypeVar, Callable, Iterator, Union
+from datetime import datetime
 
 
 # ============================================================================
@@ -85,15 +97,24 @@ def paginate(
     """
     total = len(items)
     
+    if limit is not None:
+        # Clamp offset to valid range
+        offset = max(0, min(offset, total))
+        end = offset + limit
+    
     # Apply sorting for consistent ordering (prevents out-of-order issues)
     if sort_key is not None:
-        items = sorted(items, key=sort_key, reverse=sort_reverse)
+        if limit is not None and limit >= 0 and end < total:
+            # Only the first `end` items are needed: partial selection is
+            # O(n log k) and returns the same (stable) order as sorted()[:end].
+            # Negative limits slice from the end, so they need the full sort
+            select = heapq.nlargest if sort_reverse else heapq.nsmallest
+            items = select(end, items, key=sort_key)
+        else:
+            items = sorted(items, key=sort_key, reverse=sort_reverse)
     
     # Apply pagination only if limit is specified
     if limit is not None:
-        # Clamp offset to valid range
-        offset = max(0, min(offset, total))
-        end = offset + limit
         paginated_items = items[offset:end]
         has_more = end < total
     else:
@@ -111,19 +132,75 @@ def paginate(
     )
 
 
-# In-memory cache for parsed tags
+# In-memory cache for parsed tags (bounded LRU)
 # Format: {file_path: (mtime, tags)}
-_tag_cache: Dict[str, Tuple[float, List[str]]] = {}
+_TAG_CACHE_MAX_ENTRIES = 8192
+_tag_cache: "OrderedDict[str, Tuple[float, List[str]]]" = OrderedDict()
+# Cached file keys per parent folder, so folder moves/deletes can invalidate a
+# subtree without scanning every cached key.
+# Format: {folder_path: {file_path, ...}}
+_tag_cache_folders: Dict[str, set] = {}
+_tag_cache_lock = threading.Lock()
+
+
+def _tag_cache_get(file_key: str, mtime: float) -> Optional[List[str]]:
+    """Return cached tags if the entry exists and mtime matches."""
+    with _tag_cache_lock:
+        entry = _tag_cache.get(file_key)
+        if entry is None or entry[0] != mtime:
+            return None
+        _tag_cache.move_to_end(file_key)
+        return entry[1]
+
+
+def _tag_cache_forget(file_key: str) -> None:
+    """Remove a key from the folder index (caller holds the lock)."""
+    folder_key = os.path.dirname(file_key)
+    siblings = _tag_cache_folders.get(folder_key)
+    if siblings is not None:
+        siblings.discard(file_key)
+        if not siblings:
+            del _tag_cache_folders[folder_key]
+
+
+def _tag_cache_put(file_key: str, mtime: float, tags: List[str]) -> None:
+    """Store tags for a file, evicting the least recently used entries."""
+    with _tag_cache_lock:
+        _tag_cache[file_key] = (mtime, tags)
+        _tag_cache.move_to_end(file_key)
+        _tag_cache_folders.setdefault(os.path.dirname(file_key), set()).add(file_key)
+        while len(_tag_cache) > _TAG_CACHE_MAX_ENTRIES:
+            evicted_key, _entry = _tag_cache.popitem(last=False)
+            _tag_cache_forget(evicted_key)
+
+
+def _tag_cache_invalidate(file_key: str) -> None:
+    """Drop the cached tags of a single file."""
+    with _tag_cache_lock:
+        if _tag_cache.pop(file_key, None) is not None:
+            _tag_cache_forget(file_key)
+
+
+def _tag_cache_invalidate_folder(folder_key: str) -> None:
+    """Drop the cached tags of every file in a folder and its subfolders."""
+    prefix = folder_key.rstrip(os.sep) + os.sep
+    with _tag_cache_lock:
+        affected = [f for f in _tag_cache_folders if f == folder_key or f.startswith(prefix)]
+        for folder in affected:
+            for file_key in _tag_cache_folders.pop(folder):
+                _tag_cache.pop(file_key, None)
 
 # Notes tree scan cache (TTL).
 #
 # This avoids repeated full-directory walks when multiple endpoints (or the UI)
-# request indexes in quick succession.
+# request indexes in quick succession. Entries also carry the notes version, so
+# changes made through this module show up immediately; the TTL only bounds
+# how long edits made outside the app can go unseen.
 
 _SCAN_WALK_CACHE_LOCK = threading.Lock()
 _SCAN_WALK_CACHE_TTL_SECONDS = 1.0
-# key: (resolved_notes_dir, include_media) -> (cached_at_monotonic_seconds, (notes, folders))
-_SCAN_WALK_CACHE: Dict[Tuple[str, bool], Tuple[float, Tuple[List[Dict], List[str]]]] = {}
+# key: (resolved_notes_dir, include_media) -> (cached_at_monotonic_seconds, notes_version, (notes, folders))
+_SCAN_WALK_CACHE: Dict[Tuple[str, bool], Tuple[float, int, Tuple[List[Dict], List[str]]]] = {}
 
 
 def _scan_cache_get(key: Tuple[str, bool]) -> Optional[Tuple[List[Dict], List[str]]]:
@@ -132,19 +209,212 @@ def _scan_cache_get(key: Tuple[str, bool]) -> Optional[Tuple[List[Dict], List[st
         entry = _SCAN_WALK_CACHE.get(key)
         if not entry:
             return None
-        cached_at, value = entry
-        if (now - cached_at) > _SCAN_WALK_CACHE_TTL_SECONDS:
+        cached_at, version, value = entry
+        if (now - cached_at) > _SCAN_WALK_CACHE_TTL_SECONDS or version != _notes_version:
             _SCAN_WALK_CACHE.pop(key, None)
             return None
         return value
 
 
-def _scan_cache_set(key: Tuple[str, bool], value: Tuple[List[Dict], List[str]]) -> None:
+def _scan_cache_set(key: Tuple[str, bool], version: int, value: Tuple[List[Dict], List[str]]) -> None:
     with _SCAN_WALK_CACHE_LOCK:
-        _SCAN_WALK_CACHE[key] = (time.monotonic(), value)
+        _SCAN_WALK_CACHE[key] = (time.monotonic(), version, value)
+
+
+# Note content cache (search / backlinks).
+#
+# Every search and backlink lookup reads all notes; repeated queries re-read the
+# same unchanged files. Entries are validated against (mtime_ns, size) on each
+# lookup to catch edits made outside the app, and are dropped by every write,
+# move and delete made through this module (timestamps can be too coarse to
+# tell two quick saves of the same size apart).
+
+_NOTE_CONTENT_CACHE_LOCK = threading.Lock()
+_NOTE_CONTENT_CACHE_MAX_ENTRIES = 2048
+_NOTE_CONTENT_CACHE_MAX_BYTES = 64 * 1024 * 1024  # Total size of the cached notes
+_NOTE_CONTENT_CACHE_MAX_FILE_SIZE = 1024 * 1024  # Don't pin very large notes in memory
+# key: absolute file path -> (mtime_ns, size, content)
+_NOTE_CONTENT_CACHE: "OrderedDict[str, Tuple[int, int, str]]" = OrderedDict()
+_note_content_cache_bytes = 0
+
+
+def _note_content_cache_pop(file_key: str) -> None:
+    """Remove one entry and its size from the total (caller holds the lock)."""
+    global _note_content_cache_bytes
+    entry = _NOTE_CONTENT_CACHE.pop(file_key, None)
+    if entry is not None:
+        _note_content_cache_bytes -= entry[1]
+
+
+def _note_content_cache_invalidate(file_path: str) -> None:
+    """Drop the cached content of a single note."""
+    with _NOTE_CONTENT_CACHE_LOCK:
+        _note_content_cache_pop(os.path.abspath(file_path))
+
+
+def _note_content_cache_invalidate_folder(folder_path: str) -> None:
+    """Drop the cached content of every note in a folder and its subfolders."""
+    prefix = os.path.abspath(folder_path).rstrip(os.sep) + os.sep
+    with _NOTE_CONTENT_CACHE_LOCK:
+        for file_key in [k for k in _NOTE_CONTENT_CACHE if k.startswith(prefix)]:
+            _note_content_cache_pop(file_key)
+
+
+# Notes version: bumped by every note/folder/media write, move or delete made
+# through this module, so derived caches (scan, search results) and HTTP
+# clients can tell when they're stale.
+_notes_version_lock = threading.Lock()
+_notes_version = 0
+
+
+def _bump_notes_version() -> None:
+    """Mark the notes tree as changed."""
+    global _notes_version
+    with _notes_version_lock:
+        _notes_version += 1
+
+
+def get_notes_version() -> int:
+    """Current notes version (changes whenever notes are modified through this module)."""
+    return _notes_version
 
 
-def validate_path_security(notes_dir: str, path: Path) -> bool:
+def _decode_text(data: bytes) -> str:
+    """Decode file bytes the way text mode would (UTF-8, universal newlines)."""
+    content = data.decode('utf-8')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+def _read_text_file(file_path: Union[str, Path]) -> str:
+    """Read a whole UTF-8 text file in one binary read and a single decode."""
+    with open(file_path, 'rb') as f:
+        return _decode_text(f.read())
+
+
+def _read_note_cached(file_path: str, prefilter: Optional["re.Pattern[bytes]"] = None) -> Optional[str]:
+    """
+    Read a note's text, reusing the cached copy while (mtime, size) are unchanged.
+    
+    If prefilter is given and the note isn't cached, the raw bytes are checked
+    first and None is returned when they can't match, skipping the decode.
+    """
+    global _note_content_cache_bytes
+    file_key = os.path.abspath(file_path)
+    # Read before the file: a write made while we read leaves nothing cached
+    version = _notes_version
+    st = os.stat(file_path)
+    with _NOTE_CONTENT_CACHE_LOCK:
+        entry = _NOTE_CONTENT_CACHE.get(file_key)
+        if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            _NOTE_CONTENT_CACHE.move_to_end(file_key)
+            return entry[2]
+
+    with open(file_path, 'rb') as f:
+        data = f.read()
+
+    if prefilter is not None and prefilter.search(data) is None:
+        return None
+
+    content = _decode_text(data)
+
+    if st.st_size <= _NOTE_CONTENT_CACHE_MAX_FILE_SIZE:
+        with _NOTE_CONTENT_CACHE_LOCK:
+            if version == _notes_version:
+                _note_content_cache_pop(file_key)
+                _NOTE_CONTENT_CACHE[file_key] = (st.st_mtime_ns, st.st_size, content)
+                _note_content_cache_bytes += st.st_size
+                while (len(_NOTE_CONTENT_CACHE) > _NOTE_CONTENT_CACHE_MAX_ENTRIES
+                       or _note_content_cache_bytes > _NOTE_CONTENT_CACHE_MAX_BYTES):
+                    _evicted_key, evicted = _NOTE_CONTENT_CACHE.popitem(last=False)
+                    _note_content_cache_bytes -= evicted[1]
+    return content
+
+
+# Thread pool for per-note file I/O (search, tag parsing).
+#
+# Reads release the GIL, so several notes can be read at once. Small vaults
+# stay serial. The pool is created on first use and shared by every scan and
+# search (searches re-run while the user types). Functions run on it must not
+# call _io_map themselves.
+
+_IO_POOL_MIN_ITEMS = 64
+_IO_POOL_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+_io_pool: Optional[ThreadPoolExecutor] = None
+_io_pool_lock = threading.Lock()
+
+
+def _get_io_pool() -> ThreadPoolExecutor:
+    """The shared I/O thread pool."""
+    global _io_pool
+    if _io_pool is None:
+        with _io_pool_lock:
+            if _io_pool is None:
+                _io_pool = ThreadPoolExecutor(
+                    max_workers=_IO_POOL_MAX_WORKERS, thread_name_prefix="notes-io"
+                )
+    return _io_pool
+
+
+def _io_map(func: Callable[[T], Any], items: List[T]) -> List[Any]:
+    """Apply func to every item, in a thread pool for large inputs. Order is preserved."""
+    if len(items) < _IO_POOL_MIN_ITEMS:
+        return [func(item) for item in items]
+    return list(_get_io_pool().map(func, items))
+
+
+@lru_cache(maxsize=16)
+def _resolved_notes_root(notes_dir: str) -> str:
+    """Resolved (symlink-free, normcased) notes directory, cached per process."""
+    return os.path.normcase(os.path.realpath(notes_dir))
+
+
+@lru_cache(maxsize=16)
+def _absolute_notes_root(notes_dir: str) -> str:
+    """Absolute (unresolved) notes directory, cached per process."""
+    return os.path.abspath(notes_dir)
+
+
+def _is_link_or_reparse_point(st: os.stat_result) -> bool:
+    """True for symlinks, and for junctions/other reparse points on Windows."""
+    return S_ISLNK(st.st_mode) or bool(getattr(st, 'st_file_attributes', 0) & 0x400)
+
+
+def _is_plainly_within(notes_dir: str, path_str: str) -> bool:
+    """
+    Fast path for validate_path_security: True if path_str lies inside notes_dir
+    without '..' segments or symlinks below the notes root.
+    
+    Only the components under the root are lstat'ed; a False result just means
+    the full realpath check has to decide.
+    """
+    if '..' in path_str.replace('\\', '/').split('/'):
+        return False
+    
+    root = _absolute_notes_root(notes_dir)
+    abs_path = os.path.abspath(path_str)
+    norm_root = os.path.normcase(root).rstrip(os.sep)
+    norm_path = os.path.normcase(abs_path)
+    if norm_path == os.path.normcase(root):
+        return True
+    if not norm_path.startswith(norm_root + os.sep):
+        return False
+    
+    current = root
+    for part in abs_path[len(norm_root) + 1:].split(os.sep):
+        current = os.path.join(current, part)
+        try:
+            st = os.lstat(current)
+        except OSError:
+            # Missing from here on down, so nothing below can be a link either
+            return True
+        if _is_link_or_reparse_point(st):
+            return False
+    return True
+
+
+def validate_path_security(notes_dir: str, path: Union[str, Path]) -> bool:
     """
     Validate that a path is within the notes directory (security check).
     Prevents path traversal attacks.
@@ -156,11 +426,41 @@ def validate_path_security(notes_dir: str, path: Path) -> bool:
     Returns:
         True if path is safe, False otherwise
     """
-    try:
-        path.resolve().relative_to(Path(notes_dir).resolve())
+    notes_dir = str(notes_dir)
+    path_str = os.fspath(path)
+    if _is_plainly_within(notes_dir, path_str):
         return True
+    
+    # Anything else ('..', symlinks, paths given in another form) is decided
+    # on the fully resolved path: a symlink inside the notes directory must
+    # not be able to point outside of it
+    root = _resolved_notes_root(notes_dir)
+    resolved = os.path.normcase(os.path.realpath(path_str))
+    return resolved == root or resolved.startswith(root.rstrip(os.sep) + os.sep)
+
+
+# Errors pathlib ignores in exists()/is_file()/is_dir() (missing path, a file
+# used as a folder, symlink loops, invalid Windows names)
+_STAT_MISSING_ERRNOS = frozenset((errno.ENOENT, errno.ENOTDIR, errno.EBADF, errno.ELOOP))
+_STAT_MISSING_WINERRORS = frozenset((21, 123, 1921))
+
+
+def _stat_or_none(path: Union[str, Path]) -> Optional[os.stat_result]:
+    """
+    stat() a path, returning None if it doesn't exist.
+    
+    One syscall answers both "does it exist?" and "is it a file/folder?"
+    (via S_ISREG/S_ISDIR on st_mode), instead of exists() + is_file()/is_dir().
+    """
+    try:
+        return os.stat(path)
+    except OSError as e:
+        # Same errors Path.exists() treats as "doesn't exist"
+        if e.errno in _STAT_MISSING_ERRNOS or getattr(e, 'winerror', None) in _STAT_MISSING_WINERRORS:
+            return None
+        raise
     except ValueError:
-        return False
+        return None
 
 
 def ensure_directories(config: dict):
@@ -171,109 +471,207 @@ def ensure_directories(config: dict):
     ]
     
     for dir_path in dirs:
-        Path(dir_path).mkdir(parents=True, exist_ok=True)
+        os.makedirs(dir_path, exist_ok=True)
 
 
 def create_folder(notes_dir: str, folder_path: str) -> bool:
     """Create a new folder in the notes directory"""
-    full_path = Path(notes_dir) / folder_path
+    full_path = os.path.normpath(os.path.join(notes_dir, folder_path))
     
     # Security check
     if not validate_path_security(notes_dir, full_path):
         return False
     
-    full_path.mkdir(parents=True, exist_ok=True)
+    os.makedirs(full_path, exist_ok=True)
+    _bump_notes_version()
     
     return True
 
 
-def scan_notes_fast_walk(notes_dir: str, use_cache: bool = True, include_media: bool = False) -> Tuple[List[Dict], List[str]]:
-    """Fast scanner using os.walk (pure Python + stdlib).
+def _format_mtime(timestamp: float) -> str:
+    """
+    Format a file timestamp as a UTC ISO 8601 string.
+    
+    Produces exactly what datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+    does, without building a datetime object per file in listing loops.
+    """
+    seconds = math.floor(timestamp)
+    micros = round((timestamp - seconds) * 1_000_000)
+    if micros >= 1_000_000:
+        seconds += 1
+        micros -= 1_000_000
+    base = _format_utc_second(seconds)
+    return f"{base}.{micros:06d}+00:00" if micros else f"{base}+00:00"
 
-    Args:
-        notes_dir: Base notes directory
+
+@lru_cache(maxsize=8192)
+def _format_utc_second(seconds: int) -> str:
+    """strftime for a whole UTC second (cached: files often share mtime seconds)."""
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(seconds))
+
+
+def _walk_notes_tree(notes_dir: str, include_files: bool = True) -> Iterator[Tuple[str, List[os.DirEntry]]]:
     """
-    notes_path = Path(notes_dir)
+    Walk the notes tree with os.scandir, skipping hidden files and directories.
 
-    cache_key = (str(notes_path.resolve()), include_media)
-    if use_cache:
-        cached = _scan_cache_get(cache_key)
-        if cached is not None:
-            return cached
-
-        if not include_media:
-            media_cache_key = (str(notes_path.resolve()), True)
-            media_cached = _scan_cache_get(media_cache_key)
-            if media_cached is not None:
-                media_notes, media_folders = media_cached
-                normalized_notes = []
-                for note in media_notes:
-                    if not Path(note.get("path", "")).match("*.md"):
+    Yields (relative_folder, file_entries) per directory, where relative_folder
+    is a posix-style path ("" for the root). DirEntry type checks come from the
+    directory read itself, so no extra stat() is needed to tell files from
+    folders. Symlinked directories are not descended into (same as os.walk).
+    With include_files=False, file entries are skipped and file_entries is empty.
+    """
+    stack = [(notes_dir, "")]
+    while stack:
+        dir_path, rel_folder = stack.pop()
+        files = []
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    if entry.name.startswith('.'):
                         continue
-                    normalized_note = dict(note)
-                    normalized_note["type"] = "note"
-                    normalized_notes.append(normalized_note)
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        # Symlinks to directories are skipped: os.walk counts
+                        # them as folders and doesn't descend, so never files
+                        is_linked_dir = not is_dir and entry.is_symlink() and entry.is_dir()
+                    except OSError:
+                        continue
+                    if is_dir:
+                        child_rel = f"{rel_folder}/{entry.name}" if rel_folder else entry.name
+                        stack.append((entry.path, child_rel))
+                    elif include_files and not is_linked_dir:
+                        files.append(entry)
+        except OSError:
+            continue
+        yield rel_folder, files
 
-                normalized_value = (normalized_notes, media_folders)
-                _scan_cache_set(cache_key, normalized_value)
-                return normalized_value
 
+def _scan_notes_tree(notes_dir: str, include_media: bool) -> Tuple[List[Dict], List[str]]:
+    """Walk the notes tree once and build the (notes, folders) listing."""
     notes: List[Dict] = []
     folders_set = set()
+    # Notes whose tags aren't cached yet: (note, file_path, mtime)
+    pending_tags: List[Tuple[Dict, Path, float]] = []
 
-    for root, dirnames, filenames in os.walk(notes_path):
-        # Skip descending into dot-dirs
-        dirnames[:] = [d for d in dirnames if not d.startswith('.')]
-
-        root_path = Path(root)
-        rel_folder = root_path.relative_to(notes_path).as_posix()
-        if rel_folder != "." and not rel_folder.startswith('.'):
+    for rel_folder, entries in _walk_notes_tree(notes_dir):
+        if rel_folder:
             folders_set.add(rel_folder)
 
-        for filename in filenames:
-            if filename.startswith('.'):
+        for entry in entries:
+            filename = entry.name
+            stem, ext = os.path.splitext(filename)
+            is_markdown = ext.lower() == '.md'
+            media_type = get_media_type(filename) if include_media and not is_markdown else None
+
+            if not (is_markdown or media_type is not None):
                 continue
 
-            full_path = root_path / filename
             try:
-                st = full_path.stat()
+                # Follows symlinks; served from the scandir cache where the platform allows
+                st = entry.stat()
             except OSError:
                 continue
 
-            relative_path = full_path.relative_to(notes_path)
-            media_type = get_media_type(filename) if include_media else None
-            is_markdown = full_path.suffix.lower() == '.md'
-            should_include = is_markdown or (include_media and media_type is not None)
-
-            if not should_include:
-                continue
-
-            folder = relative_path.parent.as_posix()
-            # Get tags for this note (cached)
-            tags = get_tags_cached(full_path) if is_markdown else []
-            notes.append({
-                "name": full_path.stem,
-                "path": relative_path.as_posix(),
-                "folder": "" if folder == "." else folder,
-                "modified": datetime.fromtimestamp(st.st_mtime, tz=timezone.utc).isoformat(),
+            tags = []
+            needs_tags = False
+            if is_markdown:
+                # Cached tags are used directly; misses are parsed after the walk
+                file_path = Path(entry.path)
+                cached_tags = _tag_cache_get(str(file_path), st.st_mtime)
+                if cached_tags is None:
+                    needs_tags = True
+                else:
+                    tags = cached_tags
+            note = {
+                "name": stem,
+                "path": f"{rel_folder}/{filename}" if rel_folder else filename,
+                "folder": rel_folder,
+                "modified": _format_mtime(st.st_mtime),
                 "size": st.st_size,
                 "type": media_type if media_type else "note",
                 "tags": tags,
-            })
+            }
+            notes.append(note)
+            if needs_tags:
+                pending_tags.append((note, file_path, st.st_mtime))
+
+    # Read and parse uncached notes concurrently (cold start, edited notes)
+    parsed = _io_map(lambda item: get_tags_cached(item[1], item[2]), pending_tags)
+    for (note, _file_path, _mtime), tags in zip(pending_tags, parsed):
+        note["tags"] = tags
+
+    return sorted(notes, key=itemgetter('modified'), reverse=True), sorted(folders_set)
 
-    value = (sorted(notes, key=lambda x: x.get('modified', ''), reverse=True), sorted(folders_set))
-    if use_cache:
-        _scan_cache_set(cache_key, value)
+
+def _notes_only_view(media_value: Tuple[List[Dict], List[str]]) -> Tuple[List[Dict], List[str]]:
+    """Derive the notes-only listing from a listing that includes media."""
+    media_notes, media_folders = media_value
+    notes = [dict(note) for note in media_notes if note.get("type") == "note"]
+    return notes, media_folders
+
+
+def scan_notes_fast_walk(notes_dir: str, use_cache: bool = True, include_media: bool = False) -> Tuple[List[Dict], List[str]]:
+    """Fast scanner using os.scandir (pure Python + stdlib).
+
+    With caching enabled, one walk always collects notes *and* media and fills
+    both cache entries, so the notes-only and media listings (which the UI
+    requests back to back) share a single directory traversal.
+
+    Args:
+        notes_dir: Base notes directory
+    """
+    notes_path = Path(notes_dir)
+
+    if not use_cache:
+        return _scan_notes_tree(str(notes_path), include_media)
+
+    resolved_dir = str(notes_path.resolve())
+    cache_key = (resolved_dir, include_media)
+    cached = _scan_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Read before walking: a change made mid-walk leaves the entry stale
+    version = _notes_version
+    media_cache_key = (resolved_dir, True)
+    media_value = _scan_cache_get(media_cache_key)
+    if media_value is None:
+        media_value = _scan_notes_tree(str(notes_path), include_media=True)
+        _scan_cache_set(media_cache_key, version, media_value)
+
+    if include_media:
+        return media_value
+
+    value = _notes_only_view(media_value)
+    _scan_cache_set(cache_key, version, value)
     return value
 
+
+def get_all_folders(notes_dir: str) -> List[str]:
+    """
+    List all (non-hidden) folders in the notes directory, without touching files.
+    
+    Returns:
+        Sorted list of folder paths relative to notes_dir (posix-style)
+    """
+    # Directories only: file entries are never collected, and hidden
+    # directories are pruned before descending
+    folders = [
+        rel_folder
+        for rel_folder, _entries in _walk_notes_tree(notes_dir, include_files=False)
+        if rel_folder
+    ]
+    return sorted(folders)
+
+
 def move_note(notes_dir: str, old_path: str, new_path: str) -> tuple[bool, str]:
     """Move a note to a different location
     
     Returns:
         Tuple of (success: bool, error_message: str)
     """
-    old_full_path = Path(notes_dir) / old_path
-    new_full_path = Path(notes_dir) / new_path
+    old_full_path = os.path.normpath(os.path.join(notes_dir, old_path))
+    new_full_path = os.path.normpath(os.path.join(notes_dir, new_path))
     
     # Security checks
     if not validate_path_security(notes_dir, old_full_path):
@@ -281,27 +679,29 @@ def move_note(notes_dir: str, old_path: str, new_path: str) -> tuple[bool, str]:
     if not validate_path_security(notes_dir, new_full_path):
         return False, "Invalid destination path"
     
-    if not old_full_path.exists():
+    if not os.path.exists(old_full_path):
         return False, f"Source note does not exist: {old_path}"
     
     # Check if target already exists (prevent overwriting)
-    if new_full_path.exists():
+    if os.path.exists(new_full_path):
         return False, f"A note already exists at: {new_path}"
     
     # Invalidate cache for old path
-    old_key = str(old_full_path)
-    if old_key in _tag_cache:
-        del _tag_cache[old_key]
+    _tag_cache_invalidate(old_full_path)
     
     try:
         # Create parent directory if needed
-        new_full_path.parent.mkdir(parents=True, exist_ok=True)
+        os.makedirs(os.path.dirname(new_full_path), exist_ok=True)
         
-        # Move the file
-        old_full_path.rename(new_full_path)
+        # Move the file (target was checked above, so replace never overwrites)
+        os.replace(old_full_path, new_full_path)
     except Exception as e:
         return False, f"Failed to move file: {str(e)}"
     
+    _note_content_cache_invalidate(old_full_path)
+    _note_content_cache_invalidate(new_full_path)
+    _bump_notes_version()
+    
     # Note: We don't automatically delete empty folders to preserve user's folder structure
     
     return True, ""
@@ -313,10 +713,8 @@ def move_folder(notes_dir: str, old_path: str, new_path: str) -> tuple[bool, str
     Returns:
         Tuple of (success: bool, error_message: str)
     """
-    import shutil
-    
-    old_full_path = Path(notes_dir) / old_path
-    new_full_path = Path(notes_dir) / new_path
+    old_full_path = os.path.normpath(os.path.join(notes_dir, old_path))
+    new_full_path = os.path.normpath(os.path.join(notes_dir, new_path))
     
     # Security checks
     if not validate_path_security(notes_dir, old_full_path):
@@ -324,29 +722,37 @@ def move_folder(notes_dir: str, old_path: str, new_path: str) -> tuple[bool, str
     if not validate_path_security(notes_dir, new_full_path):
         return False, "Invalid destination path"
     
-    if not old_full_path.exists() or not old_full_path.is_dir():
+    st = _stat_or_none(old_full_path)
+    if st is None or not S_ISDIR(st.st_mode):
         return False, f"Source folder does not exist: {old_path}"
     
     # Check if target already exists
-    if new_full_path.exists():
+    if os.path.exists(new_full_path):
         return False, f"A folder already exists at: {new_path}"
     
     # Invalidate cache for all notes in this folder
-    global _tag_cache
-    old_path_str = str(old_full_path)
-    keys_to_delete = [key for key in _tag_cache.keys() if key.startswith(old_path_str)]
-    for key in keys_to_delete:
-        del _tag_cache[key]
+    _tag_cache_invalidate_folder(old_full_path)
     
     try:
         # Create parent directory if needed
-        new_full_path.parent.mkdir(parents=True, exist_ok=True)
+        os.makedirs(os.path.dirname(new_full_path), exist_ok=True)
         
-        # Move the folder
-        shutil.move(str(old_full_path), str(new_full_path))
+        # Move the folder: a plain rename within the same filesystem (target
+        # was checked above, so it never replaces anything); only a
+        # cross-device move needs shutil's copy + delete
+        try:
+            os.rename(old_full_path, new_full_path)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.move(old_full_path, new_full_path)
     except Exception as e:
         return False, f"Failed to move folder: {str(e)}"
     
+    _note_content_cache_invalidate_folder(old_full_path)
+    _note_content_cache_invalidate_folder(new_full_path)
+    _bump_notes_version()
+    
     # Note: We don't automatically delete empty folders to preserve user's folder structure
     
     return True, ""
@@ -367,23 +773,22 @@ def delete_folder(notes_dir: str, folder_path: str) -> bool:
             print(f"Security: Path is outside notes directory: {full_path}")
             return False
         
-        if not full_path.exists():
+        st = _stat_or_none(full_path)
+        if st is None:
             print(f"Folder does not exist: {full_path}")
             return False
             
-        if not full_path.is_dir():
+        if not S_ISDIR(st.st_mode):
             print(f"Path is not a directory: {full_path}")
             return False
         
         # Invalidate cache for all notes in this folder
-        global _tag_cache
-        folder_path_str = str(full_path)
-        keys_to_delete = [key for key in _tag_cache.keys() if key.startswith(folder_path_str)]
-        for key in keys_to_delete:
-            del _tag_cache[key]
+        _tag_cache_invalidate_folder(str(full_path))
         
         # Delete the folder and all its contents
         shutil.rmtree(full_path)
+        _note_content_cache_invalidate_folder(str(full_path))
+        _bump_notes_version()
         print(f"Successfully deleted folder: {full_path}")
         return True
     except Exception as e:
@@ -399,43 +804,65 @@ def get_note_content(notes_dir: str, note_path: str) -> Optional[str]:
     """Get the content of a specific note"""
     full_path = Path(notes_dir) / note_path
     
-    if not full_path.exists() or not full_path.is_file():
+    st = _stat_or_none(full_path)
+    if st is None or not S_ISREG(st.st_mode):
         return None
     
     # Security check: ensure the path is within notes_dir
     if not validate_path_security(notes_dir, full_path):
         return None
     
-    with open(full_path, 'r', encoding='utf-8') as f:
-        return f.read()
+    return _read_text_file(full_path)
+
+
+def _write_file_bytes(file_path: str, data: bytes) -> None:
+    """
+    Write bytes to a file with a raw file descriptor (no Python I/O stack).
+    
+    The file is truncated and rewritten in place, so symlinks, ownership and
+    permissions of an existing note are preserved.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    fd = os.open(file_path, flags, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
 
 
 def save_note(notes_dir: str, note_path: str, content: str) -> bool:
     """Save or update a note"""
-    full_path = Path(notes_dir) / note_path
+    full_path = os.path.normpath(os.path.join(notes_dir, note_path))
     
     # Ensure .md extension
     if not note_path.endswith('.md'):
-        full_path = full_path.with_suffix('.md')
+        full_path = os.path.splitext(full_path)[0] + '.md'
     
     # Security check
     if not validate_path_security(notes_dir, full_path):
         return False
     
     # Create parent directories if needed
-    full_path.parent.mkdir(parents=True, exist_ok=True)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
     
-    with open(full_path, 'w', encoding='utf-8') as f:
-        f.write(content)
+    # Keep text-mode newline behaviour (CRLF on Windows), then write in one go
+    if os.linesep != '\n':
+        content = content.replace('\n', os.linesep)
+    _write_file_bytes(full_path, content.encode('utf-8'))
+    _note_content_cache_invalidate(full_path)
+    _bump_notes_version()
     
     return True
 
 
 def delete_note(notes_dir: str, note_path: str) -> bool:
     """Delete a note"""
-    full_path = Path(notes_dir) / note_path
+    full_path = os.path.normpath(os.path.join(notes_dir, note_path))
     
-    if not full_path.exists():
+    if not os.path.exists(full_path):
         return False
     
     # Security check
@@ -443,81 +870,218 @@ def delete_note(notes_dir: str, note_path: str) -> bool:
         return False
     
     # Invalidate cache for this note
-    file_key = str(full_path)
-    if file_key in _tag_cache:
-        del _tag_cache[file_key]
+    _tag_cache_invalidate(full_path)
     
-    full_path.unlink()
+    os.unlink(full_path)
+    _note_content_cache_invalidate(full_path)
+    _bump_notes_version()
     
     # Note: We don't automatically delete empty folders to preserve user's folder structure
     
     return True
 
 
+# Notes at least this large are pre-checked through mmap before being decoded
+_MMAP_MIN_FILE_SIZE = 64 * 1024
+
+# Non-ASCII characters that case-insensitively match an ASCII letter
+# (e.g. 'K' KELVIN SIGN matches 'k'), as UTF-8 bytes
+_UTF8_CASE_FOLD_EXTRAS = {
+    'i': (b'\xc4\xb0', b'\xc4\xb1'),
+    'k': (b'\xe2\x84\xaa',),
+    's': (b'\xc5\xbf',),
+}
+
+
+@lru_cache(maxsize=128)
+def _compile_query(query: str) -> "re.Pattern[str]":
+    """Compile a search query into a case-insensitive literal pattern."""
+    return re.compile(re.escape(query), re.IGNORECASE)
+
+
+@lru_cache(maxsize=128)
+def _compile_query_bytes(query: str) -> Optional["re.Pattern[bytes]"]:
+    """
+    Compile an ASCII query into a bytes pattern for scanning raw UTF-8 data.
+    
+    A miss on the bytes pattern guarantees the text pattern (re.IGNORECASE)
+    would miss too, so it can be used to skip notes without decoding them.
+    Returns None when the query can't be checked this way (non-ASCII or
+    containing line breaks, which text mode normalizes).
+    """
+    if not query.isascii() or '\n' in query or '\r' in query:
+        return None
+    parts = []
+    for char in query:
+        extras = _UTF8_CASE_FOLD_EXTRAS.get(char.lower())
+        escaped = re.escape(char.encode('ascii'))
+        if extras:
+            parts.append(b'(?:' + b'|'.join((escaped,) + tuple(re.escape(e) for e in extras)) + b')')
+        else:
+            parts.append(escaped)
+    return re.compile(b''.join(parts), re.IGNORECASE)
+
+
+def _large_note_may_match(file_path: str, bytes_pattern: "re.Pattern[bytes]") -> bool:
+    """Check a large note for the query via mmap, without reading it into memory."""
+    try:
+        with open(file_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return bytes_pattern.search(mm) is not None
+    except (OSError, ValueError):
+        # Can't map it (e.g. file emptied meanwhile) - let the normal path decide
+        return True
+
+
+def _search_note_file(
+    notes_dir: str,
+    note: Dict,
+    pattern: "re.Pattern[str]",
+    bytes_pattern: Optional["re.Pattern[bytes]"] = None
+) -> Optional[Dict]:
+    """Search a single note for the compiled query; returns a result dict or None."""
+    md_file = Path(notes_dir) / note["path"]
+    try:
+        prefilter = bytes_pattern
+        # Large notes: rule out misses straight from the page cache
+        if bytes_pattern is not None and note.get("size", 0) >= _MMAP_MIN_FILE_SIZE:
+            if not _large_note_may_match(str(md_file), bytes_pattern):
+                return None
+            prefilter = None  # Already known to match
+        
+        # Uncached notes are checked on raw bytes before being decoded
+        content = _read_note_cached(str(md_file), prefilter=prefilter)
+        if content is None:
+            return None
+        
+        # Find all matches using regex (case-insensitive)
+        # Stop scanning after 3 matches (limit per file)
+        matches = list(islice(pattern.finditer(content), 3))
+        
+        if not matches:
+            return None
+        
+        matched_lines = []
+        # Line numbers are counted forward from the previous match, so the
+        # text before the last match is scanned once in total
+        line_number = 1
+        counted_to = 0
+        
+        for match in matches:
+            start_index = match.start()
+            end_index = match.end()
+            matched_text = match.group()  # Preserve original case
+            
+            # Create slice window: ±15 characters around match
+            context_start = max(0, start_index - 15)
+            context_end = min(len(content), end_index + 15)
+            
+            # Extract and clean parts (newlines → spaces)
+            before = escape(content[context_start:start_index].replace('\n', ' '))
+            after = escape(content[end_index:context_end].replace('\n', ' '))
+            matched_clean = escape(matched_text.replace('\n', ' '))
+            
+            # Build snippet with <mark> highlight (styled via CSS)
+            snippet = f'{before}<mark class="search-highlight">{matched_clean}</mark>{after}'
+            
+            # Add ellipsis if truncated at start
+            if context_start > 0:
+                snippet = '...' + snippet
+            
+            # Add ellipsis if truncated at end
+            if context_end < len(content):
+                snippet = snippet + '...'
+            
+            line_number += content.count('\n', counted_to, start_index)
+            counted_to = start_index
+            
+            matched_lines.append({
+                "line_number": line_number,
+                "context": snippet
+            })
+        
+        relative_path = Path(note["path"])
+        return {
+            "name": md_file.stem,
+            "path": str(relative_path.as_posix()),
+            "folder": str(relative_path.parent.as_posix()) if str(relative_path.parent) != "." else "",
+            "matches": matched_lines
+        }
+    except Exception:
+        return None
+
+
+# Search results cache (the UI re-issues the same query while typing).
+# Entries are only valid for the notes version and listing fingerprint they
+# were computed with; the fingerprint catches edits made outside the app.
+_SEARCH_CACHE_LOCK = threading.Lock()
+_SEARCH_CACHE_MAX_ENTRIES = 64
+# key: (notes_dir, query) -> (notes_version, listing_fingerprint, results)
+_SEARCH_CACHE: "OrderedDict[Tuple[str, str], Tuple[int, int, List[Dict]]]" = OrderedDict()
+
+
+def _listing_fingerprint(notes: List[Dict]) -> int:
+    """In-process hash of a listing's (path, modified, size) triples."""
+    return hash(tuple((note["path"], note["modified"], note["size"]) for note in notes))
+
+
+def get_notes_listing_etag(notes: List[Dict], folders: List[str]) -> str:
+    """
+    Weak ETag for a notes listing.
+    
+    A digest of every note's (path, modified, size, type, tags) and of the
+    folders, so it is the same across restarts and processes as long as the
+    listing is, and edits made outside the app change it too.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for note in notes:
+        digest.update(
+            f"{note['path']}\0{note['modified']}\0{note['size']}\0"
+            f"{note.get('type', '')}\0{chr(1).join(note.get('tags') or ())}\n".encode('utf-8')
+        )
+    digest.update(b'\0')
+    digest.update('\n'.join(folders).encode('utf-8'))
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _copy_search_results(results: List[Dict]) -> List[Dict]:
+    """Copy search results down to their match dicts (callers and plugins may mutate them)."""
+    return [
+        {**result, "matches": [dict(match) for match in result["matches"]]}
+        for result in results
+    ]
+
+
 def search_notes(notes_dir: str, query: str) -> List[Dict]:
     """
     Full-text search through note contents only.
     Does NOT search in file names, folder names, or paths - only note content.
     Uses character-based context extraction with highlighted matches.
     """
-    from html import escape
-    results = []
+    version = _notes_version
     notes, _folders = scan_notes_fast_walk(notes_dir, include_media=False)
-
-    for note in notes:
-        md_file = Path(notes_dir) / note["path"]
-        try:
-            with open(md_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Find all matches using regex (case-insensitive)
-            matches = list(re.finditer(re.escape(query), content, re.IGNORECASE))
-            
-            if matches:
-                matched_lines = []
-                
-                for match in matches[:3]:  # Limit to 3 matches per file
-                    start_index = match.start()
-                    end_index = match.end()
-                    matched_text = match.group()  # Preserve original case
-                    
-                    # Create slice window: ±15 characters around match
-                    context_start = max(0, start_index - 15)
-                    context_end = min(len(content), end_index + 15)
-                    
-                    # Extract and clean parts (newlines → spaces)
-                    before = escape(content[context_start:start_index].replace('\n', ' '))
-                    after = escape(content[end_index:context_end].replace('\n', ' '))
-                    matched_clean = escape(matched_text.replace('\n', ' '))
-                    
-                    # Build snippet with <mark> highlight (styled via CSS)
-                    snippet = f'{before}<mark class="search-highlight">{matched_clean}</mark>{after}'
-                    
-                    # Add ellipsis if truncated at start
-                    if context_start > 0:
-                        snippet = '...' + snippet
-                    
-                    # Add ellipsis if truncated at end
-                    if context_end < len(content):
-                        snippet = snippet + '...'
-                    
-                    # Calculate line number by counting newlines up to match start
-                    line_number = content.count('\n', 0, start_index) + 1
-                    
-                    matched_lines.append({
-                        "line_number": line_number,
-                        "context": snippet
-                    })
-                
-                relative_path = Path(note["path"])
-                results.append({
-                    "name": md_file.stem,
-                    "path": str(relative_path.as_posix()),
-                    "folder": str(relative_path.parent.as_posix()) if str(relative_path.parent) != "." else "",
-                    "matches": matched_lines
-                })
-        except Exception:
-            continue
+    fingerprint = _listing_fingerprint(notes)
+    
+    cache_key = (notes_dir, query)
+    with _SEARCH_CACHE_LOCK:
+        entry = _SEARCH_CACHE.get(cache_key)
+        if entry is not None and entry[0] == version and entry[1] == fingerprint:
+            _SEARCH_CACHE.move_to_end(cache_key)
+            return _copy_search_results(entry[2])
+    
+    # Compiled once per distinct query (cached across searches)
+    pattern = _compile_query(query)
+    bytes_pattern = _compile_query_bytes(query)
+    
+    # Notes are read and matched concurrently; results keep listing order
+    found = _io_map(lambda note: _search_note_file(notes_dir, note, pattern, bytes_pattern), notes)
+    results = [result for result in found if result is not None]
+    
+    with _SEARCH_CACHE_LOCK:
+        _SEARCH_CACHE[cache_key] = (version, fingerprint, _copy_search_results(results))
+        _SEARCH_CACHE.move_to_end(cache_key)
+        while len(_SEARCH_CACHE) > _SEARCH_CACHE_MAX_ENTRIES:
+            _SEARCH_CACHE.popitem(last=False)
     
     return results
 
@@ -526,23 +1090,32 @@ def create_note_metadata(notes_dir: str, note_path: str) -> Dict:
     """Get metadata for a note"""
     full_path = Path(notes_dir) / note_path
     
-    if not full_path.exists():
+    stat = _stat_or_none(full_path)
+    if stat is None:
         return {}
     
-    stat = full_path.stat()
-    
-    # Count lines with proper file handle management
-    with open(full_path, 'r', encoding='utf-8') as f:
-        line_count = sum(1 for _ in f)
+    # Count lines with a single read + C-level byte count
+    with open(full_path, 'rb') as f:
+        data = f.read()
+    line_count = data.count(b'\n')
+    if data and not data.endswith(b'\n'):
+        line_count += 1  # Last line has no trailing newline
     
     return {
-        "created": datetime.fromtimestamp(stat.st_ctime, tz=timezone.utc).isoformat(),
-        "modified": datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).isoformat(),
+        "created": _format_mtime(stat.st_ctime),
+        "modified": _format_mtime(stat.st_mtime),
         "size": stat.st_size,
         "lines": line_count
     }
 
 
+# Tables/patterns used by sanitize_filename: unsafe characters map to '_'
+_UNSAFE_FILENAME_CHARS_TABLE = str.maketrans(
+    {c: '_' for c in '\\/:*?"<>|' + ''.join(map(chr, range(0x20)))}
+)
+_UNDERSCORE_RUN_RE = re.compile(r'__+')
+
+
 def sanitize_filename(filename: str) -> str:
     """
     Sanitize a filename by removing/replacing dangerous filesystem characters.
@@ -563,10 +1136,11 @@ def sanitize_filename(filename: str) -> str:
     # Remove dangerous characters (replace with underscore)
     # Blocklist approach: only remove what's truly dangerous
     # Pattern: backslash, forward slash, colon, asterisk, question mark, quotes, angle brackets, pipe, control chars
-    name = re.sub(r'[\\/:*?"<>|\x00-\x1f]', '_', name)
+    name = name.translate(_UNSAFE_FILENAME_CHARS_TABLE)
     
     # Collapse multiple underscores
-    name = re.sub(r'_+', '_', name)
+    if '__' in name:
+        name = _UNDERSCORE_RUN_RE.sub('_', name)
     
     # Strip leading/trailing underscores and spaces
     name = name.strip('_ ')
@@ -643,6 +1217,7 @@ def save_uploaded_image(notes_dir: str, note_path: str, filename: str, file_data
         # Write the file
         with open(full_path, 'wb') as f:
             f.write(file_data)
+        _bump_notes_version()
         
         # Return relative path from notes_dir
         relative_path = full_path.relative_to(Path(notes_dir))
@@ -676,6 +1251,34 @@ def get_media_type(filename: str) -> Optional[str]:
     return None
 
 
+# Frontmatter tags field: the "tags:" key line, and the list lines after it
+_TAGS_KEY_RE = re.compile(r'^[^\S\n]*tags:(.*)$', re.MULTILINE)
+_TAG_LIST_BLOCK_RE = re.compile(r'(?:\n[^\S\n]*(?:[-#][^\n]*)?(?![^\n]))*')
+
+
+def _find_frontmatter(content: str) -> Optional[Tuple[int, int]]:
+    """
+    Locate the YAML frontmatter block (first line is ---, up to the next --- line).
+    
+    Returns:
+        (start, end) offsets of the text between the markers, or None
+    """
+    # Only the frontmatter block is ever scanned - never the note body
+    first_nl = content.find('\n')
+    if first_nl < 0 or content[:first_nl].strip() != '---':
+        return None
+    
+    line_start = first_nl + 1
+    while True:
+        nl = content.find('\n', line_start)
+        line_end = len(content) if nl < 0 else nl
+        if content[line_start:line_end].strip() == '---':
+            return first_nl + 1, line_start
+        if nl < 0:
+            return None
+        line_start = nl + 1
+
+
 def parse_tags(content: str) -> List[str]:
     """
     Extract tags from YAML frontmatter in markdown content.
@@ -698,65 +1301,51 @@ def parse_tags(content: str) -> List[str]:
         content: Markdown content with optional YAML frontmatter
         
     Returns:
-        List of tag strings (lowercase, no duplicates)
+        List of tag strings (lowercase, no duplicates, in frontmatter order)
     """
     tags = []
     
-    # Check if content starts with frontmatter
-    if not content.strip().startswith('---'):
-        return tags
-    
     try:
-        # Extract frontmatter (between first two --- markers)
-        lines = content.split('\n')
-        if lines[0].strip() != '---':
-            return tags
-        
-        # Find closing ---
-        end_idx = None
-        for i in range(1, len(lines)):
-            if lines[i].strip() == '---':
-                end_idx = i
-                break
-        
-        if end_idx is None:
+        bounds = _find_frontmatter(content)
+        if bounds is None:
             return tags
         
-        frontmatter_lines = lines[1:end_idx]
+        # Text between the markers
+        frontmatter = content[bounds[0]:bounds[1]]
         
         # Parse tags field
-        in_tags_list = False
-        for line in frontmatter_lines:
-            stripped = line.strip()
+        match = _TAGS_KEY_RE.search(frontmatter)
+        while match:
+            rest = match.group(1).strip()
             
             # Check for inline array format: tags: [tag1, tag2, tag3]
-            if stripped.startswith('tags:'):
-                rest = stripped[5:].strip()
-                if rest.startswith('[') and rest.endswith(']'):
-                    # Parse inline array
-                    tags_str = rest[1:-1]  # Remove [ and ]
-                    raw_tags = [t.strip() for t in tags_str.split(',')]
-                    tags.extend([t.lower() for t in raw_tags if t])
-                    break
-                elif rest:
-                    # Single tag without brackets
-                    tags.append(rest.lower())
-                    break
-                else:
-                    # Multi-line list format
-                    in_tags_list = True
-            elif in_tags_list:
-                if stripped.startswith('-'):
-                    # List item
-                    tag = stripped[1:].strip()
+            if rest.startswith('[') and rest.endswith(']'):
+                # Parse inline array
+                tags_str = rest[1:-1]  # Remove [ and ]
+                raw_tags = [t.strip() for t in tags_str.split(',')]
+                tags.extend([t.lower() for t in raw_tags if t])
+                break
+            elif rest:
+                # Single tag without brackets
+                tags.append(rest.lower())
+                break
+            
+            # Multi-line list format: the block of '- tag' lines
+            # (blank and '#' comment lines may be mixed in)
+            block = _TAG_LIST_BLOCK_RE.match(frontmatter, match.end())
+            for line in block.group().split('\n'):
+                item = line.strip()
+                if item.startswith('-'):
+                    tag = item[1:].strip()
                     if tag:
                         tags.append(tag.lower())
-                elif stripped and not stripped.startswith('#'):
-                    # End of tags list
-                    break
+            
+            # The list ends at the first other line; a repeated tags: key there
+            # is parsed too, anything else ends the field
+            match = _TAGS_KEY_RE.match(frontmatter, block.end() + 1)
         
-        # Remove duplicates and return
-        return sorted(list(set(tags)))
+        # Remove duplicates, keeping first occurrences in order
+        return list(dict.fromkeys(tags))
         
     except Exception as e:
         # If parsing fails, return empty list
@@ -764,37 +1353,63 @@ def parse_tags(content: str) -> List[str]:
         return []
 
 
-def get_tags_cached(file_path: Path) -> List[str]:
+# Bytes read from the top of a note for tag parsing; notes whose frontmatter
+# doesn't close within this window are read in full
+_FRONTMATTER_HEAD_BYTES = 4096
+
+
+def _read_frontmatter_text(file_path: Path) -> str:
+    """
+    Read enough of a note for parse_tags: usually just its first few KB.
+    
+    The head is cut at its last newline (never inside a UTF-8 sequence) and is
+    only used when it settles the question - no frontmatter at all, or a
+    frontmatter block that closes within it.
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read(_FRONTMATTER_HEAD_BYTES)
+        if len(data) < _FRONTMATTER_HEAD_BYTES:
+            return _decode_text(data)  # Whole file
+        
+        cut = data.rfind(b'\n') + 1
+        if cut:
+            head = _decode_text(data[:cut])
+            if head[:head.find('\n')].strip() != '---' or _find_frontmatter(head) is not None:
+                return head
+        
+        return _decode_text(data + f.read())
+
+
+def get_tags_cached(file_path: Path, mtime: Optional[float] = None) -> List[str]:
     """
     Get tags for a file with caching based on modification time.
     
     Args:
         file_path: Path to the markdown file
+        mtime: Modification time if the caller already stat'ed the file
         
     Returns:
         List of tags from the file (cached if mtime unchanged)
     """
-    global _tag_cache
-    
     try:
-        # Get current modification time
-        mtime = file_path.stat().st_mtime
+        # Get current modification time (skip the stat if already known)
+        if mtime is None:
+            mtime = file_path.stat().st_mtime
         file_key = str(file_path)
         
         # Check cache
-        if file_key in _tag_cache:
-            cached_mtime, cached_tags = _tag_cache[file_key]
-            if cached_mtime == mtime:
-                # Cache hit! Return cached tags
-                return cached_tags
+        cached_tags = _tag_cache_get(file_key, mtime)
+        if cached_tags is not None:
+            # Cache hit! Return cached tags
+            return cached_tags
         
         # Cache miss or stale - parse tags
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            tags = parse_tags(content)
+        # Sorted once here, before caching: note listings report tags in
+        # sorted order (as the frontend's own tag parser does)
+        tags = sorted(parse_tags(_read_frontmatter_text(file_path)))
         
         # Update cache
-        _tag_cache[file_key] = (mtime, tags)
+        _tag_cache_put(file_key, mtime, tags)
         return tags
         
     except Exception:
@@ -804,8 +1419,9 @@ def get_tags_cached(file_path: Path) -> List[str]:
 
 def clear_tag_cache():
     """Clear the tag cache (useful for testing or manual cache invalidation)"""
-    global _tag_cache
-    _tag_cache.clear()
+    with _tag_cache_lock:
+        _tag_cache.clear()
+        _tag_cache_folders.clear()
 
 
 def get_all_tags(notes_dir: str) -> Dict[str, int]:
@@ -822,9 +1438,8 @@ def get_all_tags(notes_dir: str) -> Dict[str, int]:
     notes, _folders = scan_notes_fast_walk(notes_dir, include_media=False)
 
     for note in notes:
-        md_file = Path(notes_dir) / note["path"]
-        # Get tags using cache
-        tags = get_tags_cached(md_file)
+        # Tags were already resolved (via the tag cache) by the scan
+        tags = note["tags"]
         
         for tag in tags:
             tag_counts[tag] = tag_counts.get(tag, 0) + 1
@@ -848,9 +1463,8 @@ def get_notes_by_tag(notes_dir: str, tag: str) -> List[Dict]:
     notes, _folders = scan_notes_fast_walk(notes_dir, include_media=False)
 
     for note in notes:
-        md_file = Path(notes_dir) / note["path"]
-        # Get tags using cache
-        tags = get_tags_cached(md_file)
+        # Tags were already resolved (via the tag cache) by the scan
+        tags = note["tags"]
         
         if tag_lower in tags:
             matching_notes.append({
@@ -891,22 +1505,27 @@ def get_templates(notes_dir: str) -> List[Dict]:
         return templates
     
     try:
-        for template_file in templates_path.glob("*.md"):
-            try:
-                # Security check: ensure each template is within notes directory
-                if not validate_path_security(notes_dir, template_file):
-                    print(f"Security: Skipping template outside notes directory: {template_file}")
+        with os.scandir(templates_path) as entries:
+            for entry in entries:
+                # Same matching as glob("*.md"): dot-files included, and
+                # case-insensitive where the filesystem is (Windows)
+                if not os.path.normcase(entry.name).endswith('.md'):
+                    continue
+                try:
+                    # Security check: ensure each template is within notes directory
+                    if not validate_path_security(notes_dir, entry.path):
+                        print(f"Security: Skipping template outside notes directory: {entry.path}")
+                        continue
+                    
+                    stat = entry.stat()
+                    templates.append({
+                        "name": os.path.splitext(entry.name)[0],
+                        "path": f"_templates/{entry.name}",
+                        "modified": _format_mtime(stat.st_mtime)
+                    })
+                except Exception as e:
+                    print(f"Error reading template {entry.path}: {e}")
                     continue
-                
-                stat = template_file.stat()
-                templates.append({
-                    "name": template_file.stem,
-                    "path": str(template_file.relative_to(notes_dir).as_posix()),
-                    "modified": datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).isoformat()
-                })
-            except Exception as e:
-                print(f"Error reading template {template_file}: {e}")
-                continue
     except Exception as e:
         print(f"Error accessing templates directory: {e}")
     
@@ -935,13 +1554,18 @@ def get_template_content(notes_dir: str, template_name: str) -> Optional[str]:
         return None
     
     try:
-        with open(template_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        return _read_text_file(template_path)
     except Exception as e:
         print(f"Error reading template {template_name}: {e}")
         return None
 
 
+# Placeholders understood by apply_template_placeholders
+_TEMPLATE_PLACEHOLDER_RE = re.compile(
+    r'\{\{(date|time|datetime|timestamp|year|month|day|title|folder)\}\}'
+)
+
+
 def apply_template_placeholders(content: str, note_path: str) -> str:
     """
     Replace template placeholders with actual values.
@@ -964,26 +1588,39 @@ def apply_template_placeholders(content: str, note_path: str) -> str:
     Returns:
         Content with placeholders replaced
     """
+    if '{{' not in content:
+        return content
+    
     now = datetime.now()
     note = Path(note_path)
     
     replacements = {
-        '{{date}}': now.strftime('%Y-%m-%d'),
-        '{{time}}': now.strftime('%H:%M:%S'),
-        '{{datetime}}': now.strftime('%Y-%m-%d %H:%M:%S'),
-        '{{timestamp}}': str(int(now.timestamp())),
-        '{{year}}': now.strftime('%Y'),
-        '{{month}}': now.strftime('%m'),
-        '{{day}}': now.strftime('%d'),
-        '{{title}}': note.stem,
-        '{{folder}}': note.parent.name if str(note.parent) != '.' else 'Root',
+        'date': lambda: now.strftime('%Y-%m-%d'),
+        'time': lambda: now.strftime('%H:%M:%S'),
+        'datetime': lambda: now.strftime('%Y-%m-%d %H:%M:%S'),
+        'timestamp': lambda: str(int(now.timestamp())),
+        'year': lambda: now.strftime('%Y'),
+        'month': lambda: now.strftime('%m'),
+        'day': lambda: now.strftime('%d'),
+        'title': lambda: note.stem,
+        'folder': lambda: note.parent.name if str(note.parent) != '.' else 'Root',
     }
     
-    result = content
-    for placeholder, value in replacements.items():
-        result = result.replace(placeholder, value)
+    # Single pass over the template; each value is only computed if used
+    values: Dict[str, str] = {}
+    
+    def substitute(match: "re.Match[str]") -> str:
+        name = match.group(1)
+        if name not in values:
+            values[name] = replacements[name]()
+        return values[name]
     
-    return result
+    return _TEMPLATE_PLACEHOLDER_RE.sub(substitute, content)
+
+
+# Link patterns used by get_backlinks (compiled once, matched per line)
+_WIKILINK_RE = re.compile(r'\[\[([^\]|]+)(?:\|[^\]]+)?\]\]')
+_MARKDOWN_LINK_RE = re.compile(r'\[([^\]]+)\]\((?!https?://|mailto:|#|data:)([^\)]+)\)')
 
 
 def get_backlinks(notes_dir: str, target_note_path: str) -> List[Dict]:
@@ -1032,8 +1669,7 @@ def get_backlinks(notes_dir: str, target_note_path: str) -> List[Dict]:
         # Read note content
         full_path = Path(notes_dir) / source_path
         try:
-            with open(full_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = _read_note_cached(str(full_path))
         except Exception:
             continue
         
@@ -1041,9 +1677,13 @@ def get_backlinks(notes_dir: str, target_note_path: str) -> List[Dict]:
         found_links = []
         
         for line_num, line in enumerate(lines, 1):
+            # Cheap substring check before running the link regexes
+            if '[' not in line:
+                continue
+            
             # Find wikilinks: [[target]] or [[target|display]]
             # Wikilinks use GLOBAL matching (find note anywhere by name)
-            wikilink_matches = re.finditer(r'\[\[([^\]|]+)(?:\|[^\]]+)?\]\]', line)
+            wikilink_matches = _WIKILINK_RE.finditer(line)
             for match in wikilink_matches:
                 link_target = match.group(1).strip().lower()
                 link_target_no_ext = link_target.replace('.md', '')
@@ -1066,7 +1706,7 @@ def get_backlinks(notes_dir: str, target_note_path: str) -> List[Dict]:
             
             # Find markdown links: [text](path)
             # Markdown links must RESOLVE as paths (relative to source or absolute)
-            markdown_matches = re.finditer(r'\[([^\]]+)\]\((?!https?://|mailto:|#|data:)([^\)]+)\)', line)
+            markdown_matches = _MARKDOWN_LINK_RE.finditer(line)
             for match in markdown_matches:
                 link_path = match.group(2).split('#')[0]  # Remove anchor
                 if not link_path: